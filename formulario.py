@@ -12,14 +12,26 @@ Form → Planilha + PDF (multi-sigla, dark theme, progress bar, validações)
    ID tamanho fixo, Código da oferta tamanho fixo, Nº chamado numérico (livre).
 """
 
+import io
 import os
 import re
 import json
+import atexit
+import shutil
+import hashlib
+import zipfile
+from xml.sax.saxutils import escape as _xml_escape
+import functools
+import threading
+import subprocess
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-import pandas as pd
-from docx import Document
+import openpyxl
+
+# pandas e python-docx só entram quando o fluxo realmente os usa (migração/
+# export de planilha e o fallback de substituição): o submit comum roda com
+# índice + openpyxl + XML direto, e a partida fica segundos mais rápida.
 
 # ---------------- Config base ----------------
 DEFAULT_ANO = os.environ.get("MCI_ANO", "2025")
@@ -39,21 +51,26 @@ COLUNAS_PADRAO = [
 ]
 
 # ---------------- Utilidades de SIGLA/CONFIG ----------------
+@functools.lru_cache(maxsize=32)
 def _sanitize_sigla(s: str) -> str:
+    # chamada várias vezes por submit com a mesma string; memoizar evita
+    # repetir o regex (a SIGLA quase nunca muda dentro de uma sessão)
     s = (s or "").strip().upper()
     s = re.sub(r"[^A-Z0-9]", "", s)
     return s or "MCI"
 
-def carregar_config() -> Dict[str, Any]:
+@functools.lru_cache(maxsize=4)
+def _carregar_config_cached(path: str, stamp: Optional[tuple]) -> Dict[str, Any]:
+    """Parse do config memoizado por (caminho, mtime+tamanho); stamp None = sem arquivo."""
     cfg = {
         "sigla": _sanitize_sigla(os.environ.get("MCI_SIGLA", "MCI")),
         "ano": str(DEFAULT_ANO),
         "valid": DEFAULTS_VALID.copy(),
         "last_req": 0
     }
-    if os.path.isfile(CONFIG_PATH):
+    if stamp is not None:
         try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             if isinstance(data, dict):
                 if "sigla" in data:
@@ -68,6 +85,18 @@ def carregar_config() -> Dict[str, Any]:
             pass
     return cfg
 
+def carregar_config() -> Dict[str, Any]:
+    try:
+        st = os.stat(CONFIG_PATH)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    cfg = _carregar_config_cached(CONFIG_PATH, stamp)
+    # devolve cópias: chamadores mutam 'valid' e não podem sujar o cache
+    out = dict(cfg)
+    out["valid"] = dict(cfg["valid"])
+    return out
+
 def salvar_config(sigla: str, ano: Optional[str] = None,
                   valid: Optional[Dict[str,int]] = None,
                   last_req: Optional[int] = None) -> None:
@@ -77,79 +106,377 @@ def salvar_config(sigla: str, ano: Optional[str] = None,
     if last_req is not None:
         data["last_req"] = int(last_req)
     try:
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        novo = json.dumps(data, ensure_ascii=False, indent=2)
+        try:
+            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                if f.read() == novo:
+                    return  # nada mudou: evita reescrever (e invalidar o cache)
+        except OSError:
+            pass
+        # escreve ao lado e troca com os.replace: o config nunca fica pela
+        # metade se o processo cair no meio da gravação
+        tmp = CONFIG_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(novo)
+        os.replace(tmp, CONFIG_PATH)
     except Exception:
         pass
 
-def nome_planilha(sigla: str) -> str:
-    forced = os.environ.get("MCI_XLSX", "").strip()
+@functools.lru_cache(maxsize=32)
+def _nome_planilha_cached(sigla: str, forced: str) -> str:
     return forced if forced else f"MALA{_sanitize_sigla(sigla)}.xlsx"
 
+def nome_planilha(sigla: str) -> str:
+    # memoizado por (sigla, override de ambiente); chamado 2–3x por submit
+    return _nome_planilha_cached(sigla, os.environ.get("MCI_XLSX", "").strip())
+
 # ---------------- Funções auxiliares ----------------
+# Filtro de dígitos: translate com tabela pré-montada cobre o caso ASCII em C
+# puro; o regex compilado fica só para o resíduo não-ASCII (raro).
+_NAO_DIGITO = re.compile(r"\D")
+_SO_DIGITOS = str.maketrans("", "", "".join(chr(i) for i in range(128) if not chr(i).isdigit()))
+
 def fmt_data_pt(dt: datetime) -> str:
     return f"{dt.day} de {MESES[dt.month]} de {dt.year}"
 
 def sanitize_num(s: Any) -> str:
-    if s is None or (isinstance(s, float) and pd.isna(s)):
+    # NaN escalar: auto-desigualdade (s != s) evita o dispatcher do pd.isna
+    if s is None or (isinstance(s, float) and s != s):
         return ""
-    return re.sub(r"\D", "", str(s))
+    digs = str(s).translate(_SO_DIGITOS)
+    # isdigit() aceitaria ¹²³ (AltGr+1/2/3 no ABNT2); o gate é ASCII mesmo
+    if digs and not digs.isascii():
+        digs = _NAO_DIGITO.sub("", digs)
+    return digs
 
 def get_str(s: Any) -> str:
-    return "" if (s is None or (isinstance(s, float) and pd.isna(s))) else str(s).strip()
+    return "" if (s is None or (isinstance(s, float) and s != s)) else str(s).strip()
 
-def parse_data_flex(valor: str, fallback_hoje: bool = True) -> datetime:
-    if not valor:
-        return datetime.today() if fallback_hoje else None
+# Reserva tolerante: dia/mês/ano com separador variado e ano de 2 dígitos.
+_DMY_FLEX = re.compile(r"^(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{2,4})$")
+
+@functools.lru_cache(maxsize=128)
+def _parse_data_str(valor: str) -> Optional[datetime]:
+    """Parse puro-Python de uma string de data; None se irreconhecível.
+
+    Memoizado: o submit repassa as mesmas duas strings de data várias vezes
+    (mapa do documento, chave do índice, regeneração de registro existente).
+    """
+    # dd/mm/aaaa (o formato que o GUI pré-preenche): fatiamento posicional,
+    # sem regex nem strptime — int() já rejeita lixo não numérico.
+    if len(valor) == 10 and valor[2] == "/" and valor[5] == "/":
+        try:
+            return datetime(int(valor[6:]), int(valor[3:5]), int(valor[:2]))
+        except ValueError:
+            pass  # dia/mês fora da faixa ou não numérico: segue o caminho tolerante
     for fmt in ("%d/%m/%Y","%Y-%m-%d","%d-%m-%Y","%d.%m.%Y"):
         try:
-            return datetime.strptime(str(valor), fmt)
+            return datetime.strptime(valor, fmt)
         except Exception:
             pass
+    m = _DMY_FLEX.match(valor)
+    if m:
+        d, mes, ano = map(int, m.groups())
+        if ano < 100:
+            ano += 2000
+        try:
+            return datetime(ano, mes, d)
+        except ValueError:
+            pass
     try:
-        dt = pd.to_datetime(valor, dayfirst=True, errors="coerce")
-        if pd.isna(dt):
-            raise ValueError
-        return dt.to_pydatetime()
-    except Exception:
-        return datetime.today() if fallback_hoje else None
-
-def carregar_planilha(caminho: str) -> pd.DataFrame:
-    if os.path.isfile(caminho):
-        df = pd.read_excel(caminho)
-        df.columns = [c.strip() for c in df.columns]
-        return df
-    return pd.DataFrame(columns=COLUNAS_PADRAO)
+        # cobre célula datetime convertida em str ("2025-02-01 00:00:00")
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        return None
 
-def salvar_planilha(df: pd.DataFrame, caminho: str) -> None:
+def parse_data_flex(valor: str, fallback_hoje: bool = True) -> datetime:
+    if isinstance(valor, datetime):
+        return valor
+    if valor:
+        dt = _parse_data_str(str(valor).strip())
+        if dt is not None:
+            return dt
+    return datetime.today() if fallback_hoje else None
+
+# Cache de carregar_planilha por mtime: releituras sem mudança no arquivo
+# (ex.: exportar duas vezes seguidas) não pagam o parse de novo.
+_PLAN_CACHE: Dict[str, tuple] = {}
+
+def carregar_planilha(caminho: str) -> "pd.DataFrame":
+    """Carrega a planilha inteira (uso de migração/export; o submit usa o índice).
+
+    Lê em streaming via `_iter_valores` (calamine quando instalado, senão
+    openpyxl read_only) e só monta o DataFrame na borda. O resultado fica em
+    cache enquanto o mtime do arquivo não mudar; devolve sempre uma cópia
+    para o chamador poder alterar à vontade.
+    """
+    import pandas as pd
+    if not os.path.isfile(caminho):
+        return pd.DataFrame(columns=COLUNAS_PADRAO)
+    stamp = os.stat(caminho).st_mtime_ns
+    em_cache = _PLAN_CACHE.get(caminho)
+    if em_cache is not None and em_cache[0] == stamp:
+        return em_cache[1].copy()
+    df = _ler_planilha(caminho)
+    _PLAN_CACHE[caminho] = (stamp, df)
+    return df.copy()
+
+def _ler_planilha(caminho: str) -> "pd.DataFrame":
+    import pandas as pd
+    it = _iter_valores(caminho)
+    header = next(it, None)
+    if not header:
+        return pd.DataFrame(columns=COLUNAS_PADRAO)
+    cols = [str(h).strip() if h is not None else "" for h in header]
+    n = len(cols)
+    # leitores streaming cortam células vazias no fim da linha: completa com None
+    linhas = [row[:n] + (None,) * (n - len(row)) for row in it]
+    return pd.DataFrame(linhas, columns=cols)
+
+def append_planilha(caminho: str, dados: Dict[str, Any]) -> None:
+    """Acrescenta **uma** linha à planilha sem passar por DataFrame.
+
+    Se a planilha ainda não existe, cria com o cabeçalho padrão usando o modo
+    write-only do openpyxl (streaming, memória constante). Se já existe, abre
+    e dá `ws.append(...)` — o load/save do openpyxl ainda relê e regrava o
+    arquivo todo (O(linhas)), mas sem o custo de montar e serializar um
+    DataFrame por clique como no to_excel antigo.
+    """
+    linha = [dados.get(c) for c in COLUNAS_PADRAO]
+    if not os.path.isfile(caminho):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(COLUNAS_PADRAO)
+        ws.append(linha)
+        wb.save(caminho)
+        return
+    wb = openpyxl.load_workbook(caminho)
+    ws = wb.active
+    ws.append(linha)
+    wb.save(caminho)
+
+# Partes fixas de um pacote xlsx mínimo (uma aba, sem estilos). Escrever o
+# SpreadsheetML direto pula o modelo de células do openpyxl inteiro.
+_XLSX_ESTATICOS = {
+    "[Content_Types].xml":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>',
+    "_rels/.rels":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>',
+    "xl/workbook.xml":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+        ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+    "xl/_rels/workbook.xml.rels":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>',
+    "xl/styles.xml":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>',
+}
+
+def _export_xlsx_fast(colunas: list, linhas, caminho: str) -> None:
+    """Grava um xlsx mínimo emitindo o SpreadsheetML na mão.
+
+    Números viram <v> direto; o resto sai como inline string escapada (datas
+    incluídas — neste arquivo elas já circulam como texto dd/mm/aaaa). Sem
+    objetos de célula nem estilos: uma passada de string-building por linha.
+    """
+    from openpyxl.utils import get_column_letter
+    letras = [get_column_letter(i + 1) for i in range(len(colunas))]
+
+    def _linha(r: int, valores) -> str:
+        partes = [f'<row r="{r}">']
+        for letra, v in zip(letras, valores):
+            if v is None or (isinstance(v, float) and v != v):
+                continue
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                partes.append(f'<c r="{letra}{r}"><v>{v!r}</v></c>')
+            else:
+                partes.append(
+                    '<c r="%s%d" t="inlineStr"><is><t xml:space="preserve">%s</t></is></c>'
+                    % (letra, r, _xml_escape(str(v))))
+        partes.append('</row>')
+        return ''.join(partes)
+
+    buf = io.StringIO()
+    buf.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+              '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+              '<sheetData>')
+    buf.write(_linha(1, colunas))
+    for i, row in enumerate(linhas, 2):
+        buf.write(_linha(i, row))
+    buf.write('</sheetData></worksheet>')
+    with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED) as z:
+        for nome, xml in _XLSX_ESTATICOS.items():
+            z.writestr(nome, xml)
+        z.writestr("xl/worksheets/sheet1.xml", buf.getvalue())
+
+def salvar_planilha_bulk(df: "pd.DataFrame", caminho: str) -> None:
+    """Reescreve a planilha **inteira** em streaming (migração/reconstrução).
+
+    Não é o caminho do submit (lá é `append_planilha`); serve para quando a
+    planilha toda precisa ser regravada. Usa xlsxwriter em constant_memory
+    quando instalado; senão, o emissor SpreadsheetML direto. Nos dois casos as
+    linhas saem direto de itertuples, sem células estilizadas em memória.
+    """
+    import pandas as pd
     for c in COLUNAS_PADRAO:
         if c not in df.columns:
             df[c] = None
-    df.to_excel(caminho, index=False)
-
-def proximo_nreq(df: pd.DataFrame, last_req_cfg: int = 0) -> int:
-    """Próximo número baseado **apenas** na planilha; se vazia, usa fallback do config."""
-    if "N req." in df.columns and not df.empty:
-        nums = pd.to_numeric(df["N req."], errors="coerce")
-        if not nums.dropna().empty:
-            return int(nums.max()) + 1
+    df = df.astype(object).where(pd.notna(df), None)
+    cols = list(df.columns)
+    try:
+        import xlsxwriter
+    except ImportError:
+        _export_xlsx_fast(cols, df.itertuples(index=False, name=None), caminho)
+        return
+    with xlsxwriter.Workbook(caminho, {"constant_memory": True}) as wb:
+        ws = wb.add_worksheet()
+        ws.write_row(0, 0, cols)
+        for i, row in enumerate(df.itertuples(index=False, name=None), 1):
+            ws.write_row(i, 0, row)
+
+def proximo_nreq(index: Dict[str, Any], last_req_cfg: int = 0) -> int:
+    """Próximo número baseado **apenas** na planilha (via índice); se vazia, usa fallback do config."""
+    last = int(index.get("last_nreq", 0))
+    if last:
+        return last + 1
     return last_req_cfg + 1 if last_req_cfg else 1
 
-def existe_registro(df: pd.DataFrame, dados: Dict[str, Any]) -> Optional[int]:
-    if df.empty:
-        return None
-    filtros = (df.get("NOME","").astype(str).str.strip().str.casefold()
-               == str(dados.get("NOME","")).strip().casefold())
-    for col in ("ID","CPF","Data"):
-        if col in df.columns:
-            filtros = filtros & (df[col].astype(str).str.strip() == str(dados.get(col,"")).strip())
-    existentes = df[filtros]
-    if existentes.empty:
-        return None
+def existe_registro(index: Dict[str, Any], dados: Dict[str, Any]) -> Optional[int]:
+    """Busca O(1) no índice pela chave normalizada (NOME+ID+CPF+Data)."""
+    nreq = index.get("keys", {}).get(_chave_registro(dados))
+    return int(nreq) if nreq is not None else None
+
+# ---------------- Índice lateral da planilha ----------------
+# A planilha é usada como um "banco" só para duas consultas: máximo de
+# 'N req.' e existência de (NOME+ID+CPF+Data). Um MALA<SIGLA>.index.json
+# ao lado responde ambas em O(1), sem ler o xlsx a cada abertura/submit.
+
+def _indice_path(caminho: str) -> str:
+    base, _ = os.path.splitext(caminho)
+    return base + ".index.json"
+
+def _chave_registro(dados: Dict[str, Any]) -> str:
+    """Hash estável da 4-tupla normalizada (NOME, ID, CPF, Data)."""
+    dt = parse_data_flex(get_str(dados.get("Data")), fallback_hoje=False)
+    bruto = "|".join((
+        get_str(dados.get("NOME")).casefold(),
+        sanitize_num(dados.get("ID")),
+        sanitize_num(dados.get("CPF")),
+        dt.strftime("%Y-%m-%d") if dt else "",
+    ))
+    return hashlib.sha1(bruto.encode("utf-8")).hexdigest()
+
+def _iter_valores(caminho: str):
+    """Linhas cruas da primeira aba, como tuplas (gerador).
+
+    Com python-calamine instalado usa o leitor em Rust (streaming, sem montar
+    árvore lxml — na prática 2–10x mais rápido que o openpyxl); senão, cai no
+    modo read_only do openpyxl. Células vazias saem como None nos dois casos.
+    """
     try:
-        return int(pd.to_numeric(existentes.iloc[0]["N req."], errors="coerce"))
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+        try:
+            yield from wb.active.iter_rows(values_only=True)
+        finally:
+            wb.close()
+        return
+    planilha = CalamineWorkbook.from_path(caminho).get_sheet_by_index(0)
+    for row in planilha.to_python(skip_empty_area=True):
+        yield tuple(v if v != "" else None for v in row)
+
+def stream_rows(caminho: str):
+    """Itera a planilha linha a linha como dicts, sem DataFrame.
+
+    O parse é streaming (calamine ou openpyxl read_only), então a memória
+    fica constante mesmo para planilhas grandes.
+    """
+    it = _iter_valores(caminho)
+    header = next(it, None)
+    if not header:
+        return
+    pos = {str(h).strip(): i for i, h in enumerate(header) if h is not None}
+    for row in it:
+        yield {c: row[pos[c]] for c in COLUNAS_PADRAO
+               if c in pos and pos[c] < len(row)}
+
+def rebuild_index(caminho: str) -> Dict[str, Any]:
+    """Reconstrói o índice lendo o xlsx em streaming, linha a linha."""
+    idx: Dict[str, Any] = {"last_nreq": 0, "keys": {}}
+    if not os.path.isfile(caminho):
+        return idx
+    for dados in stream_rows(caminho):
+        try:
+            nreq = int(float(dados.get("N req.")))
+        except (TypeError, ValueError):
+            continue
+        idx["keys"][_chave_registro(dados)] = nreq
+        if nreq > idx["last_nreq"]:
+            idx["last_nreq"] = nreq
+    return idx
+
+def salvar_index(caminho: str, idx: Dict[str, Any]) -> None:
+    if os.path.isfile(caminho):
+        idx["mtime"] = os.path.getmtime(caminho)
+    try:
+        with open(_indice_path(caminho), "w", encoding="utf-8") as f:
+            json.dump(idx, f, ensure_ascii=False)
     except Exception:
-        return None
+        pass
+
+def carregar_index(caminho: str) -> Dict[str, Any]:
+    """Carrega o índice lateral; reconstrói do xlsx se ausente ou defasado.
+
+    Planilha inexistente = índice vazio, mesmo que tenha sobrado um
+    .index.json de uma planilha apagada: senão a chave antiga marcaria o
+    registro como duplicado e a linha nunca entraria na planilha nova.
+    A numeração segue preservada pelo fallback de last_req no config.
+    """
+    ipath = _indice_path(caminho)
+    if os.path.isfile(ipath) and os.path.isfile(caminho):
+        try:
+            with open(ipath, "r", encoding="utf-8") as f:
+                idx = json.load(f)
+            if (isinstance(idx, dict) and isinstance(idx.get("keys"), dict)
+                    and idx.get("mtime") == os.path.getmtime(caminho)):
+                idx["last_nreq"] = int(idx.get("last_nreq", 0))
+                return idx
+        except Exception:
+            pass
+    idx = rebuild_index(caminho)
+    salvar_index(caminho, idx)
+    return idx
+
+def registrar_no_index(index: Dict[str, Any], dados: Dict[str, Any], nreq: int,
+                       caminho: str) -> None:
+    """Atualiza o índice em memória após um append e persiste o JSON."""
+    index.setdefault("keys", {})[_chave_registro(dados)] = int(nreq)
+    index["last_nreq"] = max(int(index.get("last_nreq", 0)), int(nreq))
+    salvar_index(caminho, index)
 
 def format_cpf(digs: str) -> str:
     d = sanitize_num(digs)[:11]
@@ -171,98 +498,279 @@ def montar_mapa(row: Dict[str, Any], protocolo_num: int) -> Dict[str, str]:
         "data_retorno_ext": fmt_data_pt(dt_retorno),
     }
 
-def substituir_texto(doc: Document, mapa: Dict[str, str], sigla: str, ano: str) -> None:
-    sigla = _sanitize_sigla(sigla)
-    pares = [
-        (r"Protocolo nº \d{2}-[A-Z0-9]+/\d{4}", f"Protocolo nº {mapa['protocolo']}-{sigla}/{ano}"),
-        (r"Eu, .+?, ID nº .*?; CPF nº .*?, estudante regularmente matriculado\(a\) no curso .*?,\s*TURMA:.*?,",
-         f"Eu, {mapa['nome']}, ID nº {mapa['id']}; CPF nº {mapa['cpf']}, estudante regularmente matriculado(a) no curso {mapa['curso']}, TURMA:{mapa['turma']},"),
-        (r"Código da oferta: .*? \(preenchimento do setor da secretaria escolar\)",
-         f"Código da oferta: {mapa['oferta']} (preenchimento do setor da secretaria escolar)"),
-        (r"São Paulo, .*?\.", f"São Paulo, {mapa['data_ext']}."),
-        (r"Conforme chamado de nº .*", f"Conforme chamado de nº {mapa['chamado']}"),
-        (r"Aluno .+", f"Aluno {mapa['nome']}"),
-        (r"Data de retorno até: .*?\s+\(considerar.*\)",
-         f"Data de retorno até: {mapa['data_retorno_ext']}  (considerar de 1 a 7 dias úteis, a partir da data de solicitação)"),
-    ]
-    def apply_replace(text: str) -> str:
-        for pattern, repl in pares:
-            text = re.sub(pattern, repl, text)
-        return text
-
-    for p in doc.paragraphs:
-        if p.text:
-            joined = "".join(run.text for run in p.runs)
-            new = apply_replace(joined)
-            if new != joined:
-                p.runs[0].text = new
-                for r in p.runs[1:]:
-                    r.text = ""
+# Padrões do modelo DOCX compilados uma única vez; os textos de substituição
+# ficam como templates de str.format preenchidos por documento.
+_SUB_PATTERNS = [
+    (re.compile(r"Protocolo nº \d{2}-[A-Z0-9]+/\d{4}"),
+     "Protocolo nº {protocolo}-{sigla}/{ano}"),
+    (re.compile(r"Eu, .+?, ID nº .*?; CPF nº .*?, estudante regularmente matriculado\(a\) no curso .*?,\s*TURMA:.*?,"),
+     "Eu, {nome}, ID nº {id}; CPF nº {cpf}, estudante regularmente matriculado(a) no curso {curso}, TURMA:{turma},"),
+    (re.compile(r"Código da oferta: .*? \(preenchimento do setor da secretaria escolar\)"),
+     "Código da oferta: {oferta} (preenchimento do setor da secretaria escolar)"),
+    (re.compile(r"São Paulo, .*?\."), "São Paulo, {data_ext}."),
+    (re.compile(r"Conforme chamado de nº .*"), "Conforme chamado de nº {chamado}"),
+    (re.compile(r"Aluno .+"), "Aluno {nome}"),
+    (re.compile(r"Data de retorno até: .*?\s+\(considerar.*\)"),
+     "Data de retorno até: {data_retorno_ext}  (considerar de 1 a 7 dias úteis, a partir da data de solicitação)"),
+]
 
+# Alternação única dos 7 padrões com grupos nomeados (s0..s6): um único
+# passe de sub() resolve todas as trocas — o lastgroup indica qual template
+# usar. Também serve de gate: texto sem match sai intacto após um scan só.
+_SUB_ALL = re.compile("|".join(
+    f"(?P<s{i}>{pat.pattern})" for i, (pat, _) in enumerate(_SUB_PATTERNS)))
+
+def _substituir_tudo(texto: str, repls: list, feitos: Optional[set] = None) -> str:
+    """Aplica as 7 substituições em um único passe; anota em `feitos` os índices usados."""
+    def _rep(m):
+        i = int(m.lastgroup[1:])
+        if feitos is not None:
+            feitos.add(i)
+        return repls[i]
+    return _SUB_ALL.sub(_rep, texto)
+
+# Âncoras literais dos 7 padrões: um `in` de substring descarta parágrafo
+# sem candidato antes de qualquer regex.
+_ANCHORS = ("Protocolo nº", "Eu, ", "Código da oferta:", "São Paulo,",
+            "Conforme chamado", "Aluno ", "Data de retorno até:")
+
+# Modelos novos podem trazer tokens explícitos ({{NOME}}, {{CPF}}, ...) em
+# vez das frases-âncora: a troca deixa de depender dos padrões acima e vira
+# um campo de format direto. Os nomes espelham as chaves do contexto.
+_TOKEN_CAMPOS = ("PROTOCOLO", "NOME", "ID", "CPF", "CURSO", "TURMA", "OFERTA",
+                 "CHAMADO", "SIGLA", "ANO", "DATA_EXT", "DATA_RETORNO_EXT")
+_TOKEN_RE = re.compile(r"\{\{(%s)\}\}" % "|".join(_TOKEN_CAMPOS))
+# O mesmo token depois do escape de chaves do XML ({ -> {{).
+_TOKEN_ESC_RE = re.compile(r"\{\{\{\{(%s)\}\}\}\}" % "|".join(_TOKEN_CAMPOS))
+
+def _iter_paragraphs(doc: "Document"):
+    """Parágrafos do corpo e de todas as células de tabela, achatados."""
+    yield from doc.paragraphs
     for t in doc.tables:
         for row in t.rows:
             for cell in row.cells:
-                for p in cell.paragraphs:
-                    if p.text:
-                        joined = "".join(run.text for run in p.runs)
-                        new = apply_replace(joined)
-                        if new != joined:
-                            p.runs[0].text = new
-                            for r in p.runs[1:]:
-                                r.text = ""
-
-# ---------- Conversão DOCX → PDF (com encerramento limpo COM/Word) ----------
+                yield from cell.paragraphs
+
+# Caminho rápido: substitui direto no word/document.xml, sem montar o grafo
+# de objetos do python-docx. O regex roda UMA vez por modelo, trocando cada
+# trecho-alvo pelo próprio template de format ({nome}, {cpf}, ...); por
+# documento sobra um único format_map sobre a string tokenizada. Os padrões
+# são aplicados só ao conteúdo de cada <w:t>; se algum trecho-alvo estiver
+# fatiado entre runs, a tokenização falha (None) e o chamador usa o caminho
+# python-docx (que junta os runs por parágrafo).
+_WT_RE = re.compile(r"(<w:t(?: [^>]*)?>)([^<]*)(</w:t>)")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+@functools.lru_cache(maxsize=2)
+def _template_tokenizado_cached(path: str, mtime: int) -> Optional[str]:
+    with zipfile.ZipFile(io.BytesIO(_modelo_bytes(path))) as zin:
+        doc_xml = zin.read("word/document.xml").decode("utf-8")
+    texto_plano = _TAG_RE.sub("", doc_xml)
+    alvo = {i for i, (pat, _) in enumerate(_SUB_PATTERNS) if pat.search(texto_plano)}
+    alvo_tokens = len(_TOKEN_RE.findall(texto_plano))
+    if not alvo and not alvo_tokens:
+        return None
+
+    # chaves literais do XML viram {{ }} para sobreviver ao format_map;
+    # os campos inseridos pelos templates ficam com chave simples
+    escapado = doc_xml.replace("{", "{{").replace("}", "}}")
+    templates = [tpl for _, tpl in _SUB_PATTERNS]
+    feitos: set = set()
+    tokens_feitos = 0
+
+    def trocar(m):
+        nonlocal tokens_feitos
+        abre, texto, fecha = m.groups()
+        texto, n = _TOKEN_ESC_RE.subn(lambda t: "{%s}" % t.group(1).lower(), texto)
+        tokens_feitos += n
+        return abre + _substituir_tudo(texto, templates, feitos) + fecha
+
+    tokenizado = _WT_RE.sub(trocar, escapado)
+    if feitos != alvo or tokens_feitos != alvo_tokens:
+        return None  # padrão/token cruzando runs: só o caminho python-docx resolve
+    return tokenizado
+
+def _template_tokenizado(path: str) -> Optional[str]:
+    return _template_tokenizado_cached(path, os.stat(path).st_mtime_ns)
+
+def render_docx_fast(modelo: str, mapa: Dict[str, str],
+                     sigla: str, ano: str, out_path: str) -> bool:
+    tokenizado = _template_tokenizado(modelo)
+    if tokenizado is None:
+        return False
+    ctx = {**mapa, "sigla": _sanitize_sigla(sigla), "ano": ano}
+    novo_xml = tokenizado.format_map({k: _xml_escape(str(v)) for k, v in ctx.items()})
+    with zipfile.ZipFile(io.BytesIO(_modelo_bytes(modelo))) as zin, \
+         zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "word/document.xml":
+                data = novo_xml.encode("utf-8")
+            zout.writestr(item, data)
+    return True
+
+def substituir_texto(doc: "Document", mapa: Dict[str, str], sigla: str, ano: str) -> None:
+    from docx.oxml.ns import qn
+    ctx = {**mapa, "sigla": _sanitize_sigla(sigla), "ano": ano}
+    # Resolve os templates uma vez por documento; cada parágrafo paga um passe só.
+    repls = [tpl.format(**ctx) for _, tpl in _SUB_PATTERNS]
+
+    for p in _iter_paragraphs(doc):
+        txt = p.text
+        if not txt or not ("{{" in txt or any(a in txt for a in _ANCHORS)):
+            continue
+        joined = "".join(run.text for run in p.runs)
+        new = _substituir_tudo(joined, repls)
+        new = _TOKEN_RE.sub(lambda m: str(ctx[m.group(1).lower()]), new)
+        if new != joined:
+            # escreve direto nos <w:t> via lxml: evita os descritores
+            # Run/RunFont do python-docx (O(runs) de overhead por parágrafo)
+            ts = list(p._p.iter(qn("w:t")))
+            if not ts:
+                continue
+            primeiro = ts[0]
+            primeiro.text = new
+            primeiro.set(qn("xml:space"), "preserve")  # o setter do Run fazia isso
+            # descarta os runs depois do que ficou com o texto, em vez de
+            # blanquear w:t um a um — uma remoção por run, direto no lxml
+            run_dono = primeiro.getparent()
+            pai = run_dono.getparent()
+            visto = False
+            for el in list(pai):
+                if visto and el.tag == qn("w:r"):
+                    pai.remove(el)
+                elif el is run_dono:
+                    visto = True
+            # sobra texto só se algum w:t morava fora de `pai` (ex.: dentro
+            # de hyperlink); blanqueia apenas o que continua na árvore
+            for t in ts[1:]:
+                el = t
+                while el is not None and el is not p._p:
+                    el = el.getparent()
+                if el is p._p:
+                    t.text = ""
+
+# ---------- Conversão DOCX → PDF (Word/COM persistente) ----------
+# Subir o Word custa segundos; manter uma instância viva amortiza isso por
+# sessão. O acesso é serializado por lock e o Quit fica para o atexit.
+_WORD_LOCK = threading.Lock()
+_WORD_APP = None
+
+# LibreOffice headless: alternativa multiplataforma, detectada uma vez.
+_SOFFICE = shutil.which("soffice")
+
+def _fechar_word() -> None:
+    global _WORD_APP
+    if _WORD_APP is not None:
+        try:
+            _WORD_APP.Quit()
+        except Exception:
+            pass
+        _WORD_APP = None
+
+def _word_app():
+    """Instância única do Word via COM, criada sob demanda e reaproveitada."""
+    global _WORD_APP
+    if _WORD_APP is None:
+        try:
+            import win32com.client
+            app = win32com.client.DispatchEx("Word.Application")
+        except Exception:
+            import comtypes.client
+            app = comtypes.client.CreateObject("Word.Application")
+        app.Visible = False
+        _WORD_APP = app
+        atexit.register(_fechar_word)
+    return _WORD_APP
+
 def tentar_converter_pdf(docx_path: str, pdf_path: str) -> bool:
-    # 1) docx2pdf
+    # 1) Word persistente (win32com ou comtypes): paga o startup uma vez só
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()  # idempotente por thread; sem CoUninitialize por chamada
+        with _WORD_LOCK:
+            word = _word_app()
+            doc = word.Documents.Open(os.path.abspath(docx_path))
+            try:
+                doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)
+            finally:
+                try:
+                    doc.Close(False)
+                except Exception:
+                    pass
+        return os.path.isfile(pdf_path)
+    except Exception:
+        # instância pode ter morrido (Word fechado à mão): derruba e tenta 1x
+        _fechar_word()
+    # 2) docx2pdf (relança o Word por chamada; só vale como reserva)
     try:
         from docx2pdf import convert as docx2pdf_convert
         docx2pdf_convert(docx_path, pdf_path)
         return os.path.isfile(pdf_path)
     except Exception:
         pass
-    # 2) comtypes
-    try:
-        import comtypes.client
-        import pythoncom
-        pythoncom.CoInitialize()
-        word = None
+    # 3) LibreOffice headless (funciona sem Word; Linux/macOS inclusive)
+    if _SOFFICE:
         try:
-            word = comtypes.client.CreateObject("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Open(os.path.abspath(docx_path))
-            doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)
-            doc.Close(False)
+            outdir = os.path.dirname(os.path.abspath(pdf_path)) or "."
+            subprocess.run(
+                [_SOFFICE, "--headless", "--convert-to", "pdf",
+                 "--outdir", outdir, os.path.abspath(docx_path)],
+                check=True, timeout=60,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            # soffice nomeia a saída pelo basename do docx
+            gerado = os.path.join(
+                outdir, os.path.splitext(os.path.basename(docx_path))[0] + ".pdf")
+            if os.path.isfile(gerado) and gerado != os.path.abspath(pdf_path):
+                os.replace(gerado, pdf_path)
             return os.path.isfile(pdf_path)
-        finally:
-            if word is not None:
-                try: word.Quit()
-                except Exception: pass
-            try: pythoncom.CoUninitialize()
-            except Exception: pass
-    except Exception:
-        pass
-    # 3) win32com
+        except Exception:
+            pass
+    return False
+
+@functools.lru_cache(maxsize=2)
+def _modelo_bytes_cached(path: str, mtime: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def _modelo_bytes(path: str) -> bytes:
+    """Bytes do modelo .docx, cacheados por (caminho, mtime).
+
+    Trocar o modelo no disco invalida o cache sozinho — sem precisar
+    reabrir o app.
+    """
+    return _modelo_bytes_cached(path, os.stat(path).st_mtime_ns)
+
+# Listagem da pasta de saída em cache: um scandir por sessão em vez de dois
+# stats por submit (faz diferença em compartilhamentos SMB/OneDrive). O mtime
+# da pasta invalida o cache quando alguém mexe nela por fora.
+_SAIDAS_CACHE: Optional[set] = None
+_SAIDAS_MTIME: Optional[int] = None
+
+def _listagem_saidas() -> set:
+    global _SAIDAS_CACHE, _SAIDAS_MTIME
     try:
-        import win32com.client
-        import pythoncom
-        pythoncom.CoInitialize()
-        word = None
+        mtime = os.stat(PASTA_SAIDA).st_mtime_ns
+    except OSError:
+        _SAIDAS_CACHE, _SAIDAS_MTIME = set(), None
+        return _SAIDAS_CACHE
+    if _SAIDAS_CACHE is None or mtime != _SAIDAS_MTIME:
+        with os.scandir(PASTA_SAIDA) as it:
+            _SAIDAS_CACHE = {e.name for e in it}
+        _SAIDAS_MTIME = mtime
+    return _SAIDAS_CACHE
+
+def _registrar_saida(nome: str) -> None:
+    """Anota um arquivo recém-gravado no cache e re-carimba o mtime da pasta,
+    para a nossa própria escrita não forçar um rescan no próximo submit."""
+    global _SAIDAS_MTIME
+    if _SAIDAS_CACHE is not None:
+        _SAIDAS_CACHE.add(nome)
         try:
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Open(os.path.abspath(docx_path))
-            doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)
-            doc.Close(False)
-            return os.path.isfile(pdf_path)
-        finally:
-            if word is not None:
-                try: word.Quit()
-                except Exception: pass
-            try: pythoncom.CoUninitialize()
-            except Exception: pass
-    except Exception:
-        pass
-    return False
+            _SAIDAS_MTIME = os.stat(PASTA_SAIDA).st_mtime_ns
+        except OSError:
+            pass
 
 def gerar_documento(linha: Dict[str, Any], protocolo_num: int, sigla: str, ano: str, modelo: str) -> str:
     os.makedirs(PASTA_SAIDA, exist_ok=True)
@@ -271,24 +779,31 @@ def gerar_documento(linha: Dict[str, Any], protocolo_num: int, sigla: str, ano:
     out_docx = os.path.join(PASTA_SAIDA, base + ".docx")
     out_pdf = os.path.join(PASTA_SAIDA, base + ".pdf")
 
-    if os.path.isfile(out_pdf):
+    nomes = _listagem_saidas()
+    if base + ".pdf" in nomes:
         return out_pdf
-    if os.path.isfile(out_docx):
-        try:
-            from docx2pdf import convert as docx2pdf_convert
-            docx2pdf_convert(out_docx, out_pdf)
+    if base + ".docx" in nomes:
+        if tentar_converter_pdf(out_docx, out_pdf):
+            _registrar_saida(base + ".pdf")
             return out_pdf
-        except Exception:
-            return out_docx
+        return out_docx
 
-    doc = Document(modelo)
-    substituir_texto(doc, mapa, sigla, ano)
-    doc.save(out_docx)
+    try:
+        rapido = render_docx_fast(modelo, mapa, sigla, ano, out_docx)
+    except Exception:
+        rapido = False
+    if not rapido:
+        from docx import Document
+        doc = Document(io.BytesIO(_modelo_bytes(modelo)))
+        substituir_texto(doc, mapa, sigla, ano)
+        doc.save(out_docx)
+    _registrar_saida(base + ".docx")
 
     saida_final = out_docx
     try:
         if tentar_converter_pdf(out_docx, out_pdf):
             saida_final = out_pdf
+            _registrar_saida(base + ".pdf")
     except Exception:
         pass
     return saida_final
@@ -297,7 +812,7 @@ def gerar_documento(linha: Dict[str, Any], protocolo_num: int, sigla: str, ano:
 def iniciar_form():
     import tkinter as tk
     from tkinter import ttk, messagebox
-    import atexit
+    from concurrent.futures import ThreadPoolExecutor
 
     # Tema (mantendo seu layout claro, botões azuis e barra verde)
     def apply_dark_theme(root):
@@ -325,7 +840,7 @@ def iniciar_form():
     MODELO = DEFAULT_MODELO
 
     PLANILHA = nome_planilha(SIGLA)
-    df = carregar_planilha(PLANILHA)
+    index = carregar_index(PLANILHA)
 
     root = tk.Tk()
     root.title(f"{SIGLA} – Preencher → Planilha + PDF")
@@ -333,6 +848,13 @@ def iniciar_form():
     apply_dark_theme(root)
 
     def on_close():
+        # os._exit pula o atexit, então o Quit do Word tem que acontecer
+        # aqui — e na thread do executor, que é quem criou o objeto COM
+        # (Quit de outra thread falha e deixa um WINWORD.EXE órfão).
+        try:
+            executor.submit(_fechar_word).result(timeout=10)
+        except Exception:
+            pass
         try:
             root.quit(); root.update_idletasks(); root.destroy()
         except Exception:
@@ -391,17 +913,44 @@ def iniciar_form():
 
     # Helpers de validação
     def only_digits(s: str) -> str:
-        return re.sub(r"\D", "", s or "")
-
-    def make_numeric_limited(var: 'tk.StringVar', maxlen: int):
-        def cb(*_):
-            var.set(only_digits(var.get())[:maxlen])
-        return cb
-
-    def make_numeric_unlimited(var: 'tk.StringVar'):
-        def cb(*_):
-            var.set(only_digits(var.get()))
-        return cb
+        s = (s or "").translate(_SO_DIGITOS)
+        if s and not s.isascii():
+            s = _NAO_DIGITO.sub("", s)
+        return s
+
+    # Validação por tecla via validatecommand (%P): o Tk rejeita a edição
+    # inválida antes de ela entrar no widget — nada de trace reentrante nem
+    # reformatação em Python a cada tecla.
+    def _validador_numerico(maxlen: Optional[int]):
+        def ok(proposto: str) -> bool:
+            # isascii + isdigit: só 0-9 de verdade (isdigit sozinho deixa
+            # passar sobrescritos como ¹²³)
+            if proposto and not (proposto.isascii() and proposto.isdigit()):
+                return False
+            return maxlen is None or len(proposto) <= maxlen
+        return ok
+
+    def _colar_sanitizado(var: 'tk.StringVar', maxlen: Optional[int]):
+        # paste de valor formatado (ex.: CPF com pontos) entra limpo
+        def handler(_event):
+            try:
+                bruto = root.clipboard_get()
+            except Exception:
+                return "break"
+            limpo = only_digits(bruto)
+            if maxlen is not None:
+                limpo = limpo[:maxlen]
+            var.set(limpo)
+            return "break"
+        return handler
+
+    def entrada_numerica(parent, var: 'tk.StringVar', maxlen: Optional[int] = None,
+                         width: int = 28) -> 'ttk.Entry':
+        vcmd = (root.register(_validador_numerico(maxlen)), "%P")
+        e = ttk.Entry(parent, textvariable=var, width=width,
+                      validate="key", validatecommand=vcmd)
+        e.bind("<<Paste>>", _colar_sanitizado(var, maxlen))
+        return e
 
     # Left: Nome, Curso, Turma, Datas
     row_l = 0
@@ -419,29 +968,25 @@ def iniciar_form():
     row_r = 0
     ttk.Label(form_right, text="CPF *").grid(column=0, row=row_r, sticky="w", pady=(2,2))
     vcpf = tk.StringVar()
-    ttk.Entry(form_right, textvariable=vcpf, width=28).grid(column=1, row=row_r, sticky="we", padx=(8,0))
-    vcpf.trace_add("write", make_numeric_limited(vcpf, valid["cpf_len"]))
+    entrada_numerica(form_right, vcpf, valid["cpf_len"]).grid(column=1, row=row_r, sticky="we", padx=(8,0))
     vars_map["CPF"] = vcpf
     row_r += 1
 
     ttk.Label(form_right, text=f"ID * (máx {valid['id_len']})").grid(column=0, row=row_r, sticky="w", pady=(2,2))
     vid = tk.StringVar()
-    ttk.Entry(form_right, textvariable=vid, width=28).grid(column=1, row=row_r, sticky="we", padx=(8,0))
-    vid.trace_add("write", make_numeric_limited(vid, valid["id_len"]))
+    entrada_numerica(form_right, vid, valid["id_len"]).grid(column=1, row=row_r, sticky="we", padx=(8,0))
     vars_map["ID"] = vid
     row_r += 1
 
     ttk.Label(form_right, text=f"Código da oferta * (máx {valid['oferta_len']})").grid(column=0, row=row_r, sticky="w", pady=(2,2))
     vof = tk.StringVar()
-    ttk.Entry(form_right, textvariable=vof, width=28).grid(column=1, row=row_r, sticky="we", padx=(8,0))
-    vof.trace_add("write", make_numeric_limited(vof, valid["oferta_len"]))
+    entrada_numerica(form_right, vof, valid["oferta_len"]).grid(column=1, row=row_r, sticky="we", padx=(8,0))
     vars_map["Código da oferta"] = vof
     row_r += 1
 
     ttk.Label(form_right, text="N chamado").grid(column=0, row=row_r, sticky="w", pady=(2,2))
     vch = tk.StringVar()
-    ttk.Entry(form_right, textvariable=vch, width=28).grid(column=1, row=row_r, sticky="we", padx=(8,0))
-    vch.trace_add("write", make_numeric_unlimited(vch))
+    entrada_numerica(form_right, vch).grid(column=1, row=row_r, sticky="we", padx=(8,0))
     vars_map["N chamado"] = vch
     row_r += 1
 
@@ -454,8 +999,47 @@ def iniciar_form():
         progress["value"] = p
         progress.update_idletasks()
 
+    # Geração de DOCX/PDF fora da thread do Tk: UM worker, de propósito — o
+    # ponteiro COM do Word fica preso ao apartment (STA) da thread que o
+    # criou, e com dois workers a conversão seguinte podia cair na outra
+    # thread e estourar RPC_E_WRONG_THREAD (o _WORD_LOCK serializa, mas não
+    # muda o apartment). Um worker único vira a "thread dona" do Word pela
+    # sessão inteira. Resultado volta via root.after.
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    def _apos_gerar(fut, nreq, plan, ja_existia):
+        try:
+            saida = fut.result()
+        except Exception as e:
+            set_progress(0)
+            messagebox.showerror("Erro ao gerar documento", str(e))
+            return
+        set_progress(100)
+        if ja_existia:
+            messagebox.showinfo("Já cadastrado",
+                                f"Esse registro já estava na planilha (N req. {nreq}).\nArquivo em:\n{os.path.abspath(saida)}")
+        else:
+            messagebox.showinfo(
+                "Pronto",
+                f"Linha adicionada (N req. {nreq}).\nPlanilha: {os.path.abspath(plan)}\nArquivo em:\n{os.path.abspath(saida)}"
+            )
+        set_progress(0)
+
+    def _gerar_async(dados, nreq, sigla, ano, plan, ja_existia):
+        fut = executor.submit(gerar_documento, dados, nreq, sigla, ano, DEFAULT_MODELO)
+        # polling na thread do Tk (nada de chamar o Tk de outra thread); a
+        # barra avança devagar até 95% enquanto a conversão trabalha
+        def _tick():
+            if fut.done():
+                _apos_gerar(fut, nreq, plan, ja_existia)
+                return
+            if progress["value"] < 95:
+                set_progress(progress["value"] + 1)
+            root.after(100, _tick)
+        root.after(50, _tick)
+
     def submeter():
-        nonlocal df
+        nonlocal index
         set_progress(5)
 
         # SIGLA/ANO atuais
@@ -463,10 +1047,11 @@ def iniciar_form():
         ano_atual = str(var_ano.get()).strip() or ANO_PROTOCOLO
 
         plan = nome_planilha(sigla_atual)
-        if plan != nome_planilha(SIGLA):
-            df_local = carregar_planilha(plan)
+        plan_padrao = nome_planilha(SIGLA)
+        if plan != plan_padrao:
+            idx_local = carregar_index(plan)
         else:
-            df_local = df
+            idx_local = index
 
         # valida obrigatórios
         falhas = []
@@ -494,32 +1079,21 @@ def iniciar_form():
         set_progress(25)
 
         # Já existe?
-        nreq_existente = existe_registro(df_local, dados)
+        nreq_existente = existe_registro(idx_local, dados)
         if nreq_existente is not None:
-            try:
-                set_progress(55)
-                saida = gerar_documento(dados, nreq_existente, sigla_atual, ano_atual, DEFAULT_MODELO)
-                set_progress(100)
-                messagebox.showinfo("Já cadastrado",
-                                    f"Esse registro já estava na planilha (N req. {nreq_existente}).\nArquivo em:\n{os.path.abspath(saida)}")
-                set_progress(0)
-            except Exception as e:
-                set_progress(0)
-                messagebox.showerror("Erro ao gerar documento", str(e))
+            set_progress(55)
+            _gerar_async(dados, nreq_existente, sigla_atual, ano_atual, plan, ja_existia=True)
             return
 
         # Novo registro → próximo N req. (planilha; se vazia, usa fallback do config)
         cfg_atual = carregar_config()
-        nreq = proximo_nreq(df_local, cfg_atual.get("last_req", 0))
+        nreq = proximo_nreq(idx_local, cfg_atual.get("last_req", 0))
         dados["N req."] = nreq
 
-        # Append 1 linha
-        linha_df = pd.DataFrame([dados], columns=COLUNAS_PADRAO)
-        df_local = pd.concat([df_local, linha_df], ignore_index=True)
-
         try:
             set_progress(60)
-            salvar_planilha(df_local, plan)
+            append_planilha(plan, dados)
+            registrar_no_index(idx_local, dados, nreq, plan)
             set_progress(75)
         except Exception as e:
             set_progress(0)
@@ -532,30 +1106,20 @@ def iniciar_form():
         except Exception:
             pass
 
-        # Gera DOCX/PDF
-        try:
-            saida = gerar_documento(dados, nreq, sigla_atual, ano_atual, DEFAULT_MODELO)
-            set_progress(100)
-        except Exception as e:
-            set_progress(0)
-            messagebox.showerror("Erro ao gerar documento", str(e))
-            return
-
-        if plan == nome_planilha(SIGLA):
-            df = df_local
+        if plan == plan_padrao:
+            index = idx_local
 
-        messagebox.showinfo(
-            "Pronto",
-            f"Linha adicionada (N req. {nreq}).\nPlanilha: {os.path.abspath(plan)}\nArquivo em:\n{os.path.abspath(saida)}"
-        )
-        set_progress(0)
-
-        # limpa campos (mantém datas)
-        for label, required in campos:
+        # limpa campos já no aceite (mantém datas): se ficasse para o fim da
+        # geração, a conclusão podia apagar o que o usuário já estivesse
+        # digitando para o próximo registro
+        for label, _required in campos:
             if label in ("Data","retorno (Previsão)"):
                 continue
             vars_map[label].set("")
 
+        # Gera DOCX/PDF em background; _apos_gerar só reporta o resultado
+        _gerar_async(dados, nreq, sigla_atual, ano_atual, plan, ja_existia=False)
+
     ttk.Button(container, text="Salvar na planilha e gerar PDF", command=submeter).grid(column=0, row=6, columnspan=3, sticky="we", pady=(4,0))
 
     root.mainloop()